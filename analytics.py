@@ -0,0 +1,120 @@
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import datetime, time, timedelta
+from history import fetch_history_chunk, worker_count, THREADS_PER_PROCESS
+
+# NSE publishes the official close some minutes after 15:30; roll to the new session only once it is out
+SESSION_ROLLOVER = time(16, 0)
+AUTH_STATUSES = (401, 403)
+TRADING_DAYS = 252
+RETURN_WINDOWS = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252}
+VOL_WINDOW = 20
+
+def last_completed_session(now=None):
+    # Until the official close is published today's bar is provisional, so the latest final daily bar is
+    # the previous weekday's; weekends roll back to Friday. Used as the history end date and the cache key.
+    now = now or datetime.now()
+    day = now.date()
+    if day.weekday() < 5 and now.time() < SESSION_ROLLOVER:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+def fetch_price_matrix(jobs, end_day, timeout=60):
+    # Fetch daily closes for every job and stack them into a dates x symbols frame.
+    # Returns (prices, failed) where failed maps symbol -> error for per-symbol failures (e.g. a delisted
+    # token's 404). Call-wide failures -- an auth rejection or every symbol failing -- raise instead.
+    if not jobs:
+        return pd.DataFrame(), {}
+    jobs = [job + (end_day,) for job in jobs]
+    n_workers = worker_count(len(jobs))
+    chunks = [jobs[i:i + THREADS_PER_PROCESS] for i in range(0, len(jobs), THREADS_PER_PROCESS)]
+    # forkserver avoids forking the multi-threaded Streamlit server with other threads' locks held;
+    # workers only import the light history module
+    pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("forkserver"))
+    try:
+        results = [r for chunk in pool.map(fetch_history_chunk, chunks, timeout=timeout) for r in chunk]
+    except FuturesTimeoutError:
+        raise TimeoutError(f"History fetch for {len(jobs)} symbols did not finish within {timeout}s") from None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    failed = {symbol: error for symbol, _, error, _ in results if error}
+    auth = [symbol for symbol, _, _, status in results if status in AUTH_STATUSES]
+    if auth:
+        raise RuntimeError(f"History API rejected the session key ({failed[auth[0]]}); check integrate_api_session_key")
+    if len(failed) == len(jobs):
+        sample = next(iter(failed.values()))
+        raise RuntimeError(f"History fetch failed for all {len(jobs)} symbols, e.g. {sample}")
+
+    series = {symbol: pd.Series(closes, dtype=float) for symbol, closes, _, _ in results if closes}
+    if not series:
+        return pd.DataFrame(), failed
+    prices = pd.DataFrame(series)
+    prices.index = pd.to_datetime(prices.index, format='%d%m%Y', errors='coerce')
+    prices = prices[prices.index.notna()].sort_index()
+    prices = prices[~prices.index.duplicated(keep='last')]
+    prices = prices[prices.index <= pd.Timestamp(end_day)]
+    return prices.ffill(), failed
+
+def _nan_corr(matrix, vector):
+    # Column-wise Pearson correlation against one vector, ignoring NaN rows per column
+    mask = ~np.isnan(matrix) & ~np.isnan(vector)[:, None]
+    n = mask.sum(axis=0)
+    x = np.where(mask, matrix, 0.0)
+    y = np.where(mask, vector[:, None], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx = x.sum(axis=0) / n
+        my = y.sum(axis=0) / n
+        dx = np.where(mask, x - mx, 0.0)
+        dy = np.where(mask, y - my, 0.0)
+        cov = (dx * dy).sum(axis=0)
+        corr = cov / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+    corr[n < 3] = np.nan
+    return corr
+
+def compute_analytics(prices, quantities):
+    # prices: dates x symbols frame of daily closes; quantities: {symbol: held qty}
+    if prices.empty or len(prices) < 2:
+        return pd.DataFrame()
+    symbols = list(prices.columns)
+    p = prices.to_numpy(dtype=float)
+    last = p[-1]
+
+    out = {"Symbol": symbols, "Last Close": last}
+    for label, window in RETURN_WINDOWS.items():
+        if len(p) > window:
+            out[f"Ret {label} %"] = (last / p[-1 - window] - 1) * 100
+        else:
+            out[f"Ret {label} %"] = np.full(len(symbols), np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rets = p[1:] / p[:-1] - 1
+    recent = rets[-VOL_WINDOW:]
+    with np.errstate(invalid='ignore'):
+        out[f"Vol {VOL_WINDOW}D % (ann.)"] = np.nanstd(recent, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+        year = rets[-TRADING_DAYS:]
+        vol_1y = np.nanstd(year, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+    # Match the return columns: no 1Y figure without a full year of returns
+    vol_1y[np.count_nonzero(~np.isnan(year), axis=0) < TRADING_DAYS] = np.nan
+    out["Vol 1Y % (ann.)"] = vol_1y
+
+    running_peak = np.fmax.accumulate(p, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out["Max DD %"] = np.nanmin(p / running_peak - 1, axis=0) * 100
+
+    qty = np.array([float(quantities.get(s, 0) or 0) for s in symbols])
+    values = np.nan_to_num(last) * qty
+    total = values.sum()
+    weights = values / total if total else np.full(len(symbols), 1.0 / len(symbols))
+    port_rets = (np.nan_to_num(rets) * weights).sum(axis=1)
+    out["Corr to Portfolio"] = _nan_corr(rets, port_rets)
+    out["Weight %"] = weights * 100
+
+    df = pd.DataFrame(out)
+    num_cols = [c for c in df.columns if c != "Symbol"]
+    df[num_cols] = df[num_cols].round(2)
+    return df
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from integrate import ConnectToIntegrate, IntegrateOrders
+from profiler import OrderLatencyProfiler, load_session, replay_session
 
 # --- Definedge Credentials from Streamlit secrets ---
 definedge_api_token = st.secrets["definedge_api_token"]
@@ -11,7 +12,7 @@ definedge_api_secret = st.secrets["definedge_api_secret"]
 def get_integrate_orders():
     conn = ConnectToIntegrate()
     conn.login(api_token=definedge_api_token, api_secret=definedge_api_secret)
-    io = IntegrateOrders(conn)
+    io = IntegrateOrders(conn, profiler=OrderLatencyProfiler())
     return io
 
 io = get_integrate_orders()
@@ -26,7 +27,8 @@ section = st.sidebar.radio(
         "🛠️ Modify/Cancel Order",
         "📒 Order & Trade Book",
         "🔔 GTT/OCO Orders (Place)",
-        "🔔 GTT/OCO Modify/Cancel"
+        "🔔 GTT/OCO Modify/Cancel",
+        "⏱️ Order Latency Profiler"
     ]
 )
 
@@ -367,3 +369,43 @@ elif section == "🔔 GTT/OCO Modify/Cancel":
                             st.error(f"GTT modify failed: {e}")
     except Exception as e:
         st.error(f"GTT book error: {e}")
+
+# --- 8. Order Latency Profiler ---
+elif section == "⏱️ Order Latency Profiler":
+    st.header("Order Latency Profiler")
+    st.caption("Per-stage timings for place/modify/cancel: prepare (build and encode the request), to_headers (send until response headers arrive: network plus broker processing), body (read and decode the response). Failed calls are logged with their HTTP status or error. Each Streamlit thread reuses a keep-alive connection, so a thread's first call also pays TCP/TLS setup in to_headers.")
+    profiler = io.profiler
+    st.subheader("Summary (ms)")
+    summary = profiler.summary()
+    if summary.empty:
+        st.info("No order actions recorded yet.")
+    else:
+        st.write(f"**Failed actions: {profiler.error_count()}**")
+        st.dataframe(summary)
+        st.subheader("Rolling Log")
+        st.dataframe(profiler.to_dataframe())
+    session_path = st.text_input("Session file", value="order_session.jsonl")
+    col1, col2 = st.columns(2)
+    if col1.button("Save Session"):
+        try:
+            profiler.save_session(session_path)
+            st.success(f"Saved {len(profiler.log)} actions to {session_path}")
+        except Exception as e:
+            st.error(f"Save failed: {e}")
+    if col2.button("Clear Log"):
+        profiler.clear()
+        st.success("Latency log cleared.")
+
+    st.subheader("Replay Against Local Broker")
+    speed = st.number_input("Replay speed (0 = back to back)", min_value=0.0, value=0.0)
+    max_gap = st.number_input("Max wait between actions (s)", min_value=0.0, value=5.0)
+    response_delay_ms = st.number_input("Simulated broker response delay (ms, before headers)", min_value=0.0, value=0.0)
+    if st.button("Replay Session"):
+        try:
+            session = load_session(session_path)
+            result = replay_session(session, speed=speed, response_delay=response_delay_ms / 1000, max_gap=max_gap)
+            failed = result.error_count()
+            st.success(f"Replayed {len(result.log)} actions locally ({len(result.log) - failed} ok, {failed} failed)")
+            st.dataframe(result.summary())
+        except Exception as e:
+            st.error(f"Replay failed: {e}")
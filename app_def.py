@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from integrate import ConnectToIntegrate, IntegrateOrders
+from analytics import last_completed_session, fetch_price_matrix, compute_analytics
 import requests
 from datetime import datetime, timedelta
 
@@ -181,6 +182,42 @@ def holdings_tabular(holdings_book, master_mapping, session_key):
     }
     return df, summary
 
+def analytics_jobs_from_holdings(holdings_book, master_mapping, session_key, lookback_days=400):
+    jobs = []
+    quantities = {}
+    for h in holdings_book.get('data', []):
+        dp_qty = float(h.get("dp_qty", 0) or 0)
+        tradingsymbols = h.get("tradingsymbol")
+        if dp_qty <= 0 or not isinstance(tradingsymbols, list):
+            continue
+        for ts in tradingsymbols:
+            exch = ts.get("exchange", "NSE")
+            if exch != "NSE":
+                continue
+            tsym = ts.get("tradingsymbol", "")
+            segment_token = master_mapping.get((exch, tsym))
+            if segment_token and tsym not in quantities:
+                jobs.append((tsym, segment_token['segment'], segment_token['token'], session_key, lookback_days))
+                quantities[tsym] = dp_qty
+    return tuple(jobs), quantities
+
+ANALYTICS_RETRY_AFTER = timedelta(minutes=10)
+
+# Keyed on the last completed session, so the cache rolls once the official close is out. Call-wide
+# failures raise and are not cached; per-symbol failures are cached with the partial table and retried
+# after ANALYTICS_RETRY_AFTER (see holdings_analytics_with_retry).
+@st.cache_data(show_spinner="Fetching daily history...", ttl=timedelta(days=1), max_entries=4)
+def holdings_analytics(jobs, quantities, session_day):
+    prices, failed = fetch_price_matrix(list(jobs), session_day)
+    return compute_analytics(prices, quantities), failed, datetime.now()
+
+def holdings_analytics_with_retry(jobs, quantities, session_day):
+    df, failed, fetched_at = holdings_analytics(jobs, quantities, session_day)
+    if failed and datetime.now() - fetched_at > ANALYTICS_RETRY_AFTER:
+        holdings_analytics.clear()
+        df, failed, fetched_at = holdings_analytics(jobs, quantities, session_day)
+    return df, failed
+
 def positions_tabular(positions_book):
     raw = positions_book.get('positions', [])
     table = []
@@ -250,6 +287,19 @@ try:
         st.write(summary)
         st.write(f"**Total NSE Holdings: {len(df_hold)}**")
         st.dataframe(df_hold)
+
+        st.subheader("Holdings Analytics")
+        try:
+            jobs, quantities = analytics_jobs_from_holdings(holdings_book, master_mapping, api_session_key)
+            df_analytics, failed = holdings_analytics_with_retry(jobs, quantities, last_completed_session())
+            if failed:
+                st.warning(f"No history for {len(failed)} symbol(s), retrying in a few minutes: " + ", ".join(sorted(failed)))
+            if df_analytics.empty:
+                st.info("No daily history available for analytics.")
+            else:
+                st.dataframe(df_analytics)
+        except Exception as e:
+            st.error(f"Failed to compute analytics: {e}")
 except Exception as e:
     st.error(f"Failed to get holdings: {e}")
 
@@ -1,3 +1,5 @@
+import threading
+import time
 import requests
 
 class ConnectToIntegrate:
@@ -34,8 +36,54 @@ class ConnectToIntegrate:
         return base
 
 class IntegrateOrders:
-    def __init__(self, conn):
+    def __init__(self, conn, profiler=None):
         self.conn = conn
+        # Optional OrderLatencyProfiler; when set, order actions are timed per stage
+        self.profiler = profiler
+        # IntegrateOrders is shared across Streamlit script threads via st.cache_resource and
+        # requests.Session isn't thread-safe, so each thread gets its own keep-alive session
+        self._local = threading.local()
+
+    @property
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _order_request(self, action, method, path, params, payload=None):
+        # Stages: prepare (build and encode the request), to_headers (send until the broker's response
+        # headers arrive, i.e. network plus broker processing), body (read and decode the response)
+        stages = {}
+        status = None
+        error = None
+        t0 = time.perf_counter()
+        try:
+            url = f"{self.conn.BASE_URL}{path}"
+            headers = self.conn.headers
+            if payload is not None:
+                headers = {**headers, "Content-Type": "application/json"}
+            prep = self._session.prepare_request(requests.Request(method, url, headers=headers, json=payload))
+            settings = self._session.merge_environment_settings(prep.url, {}, True, None, None)
+            t1 = time.perf_counter()
+            stages["prepare"] = t1 - t0
+            resp = self._session.send(prep, timeout=10, **settings)
+            t2 = time.perf_counter()
+            stages["to_headers"] = t2 - t1
+            status = resp.status_code
+            # Reading the body here (send was streamed) is what the body stage measures
+            _ = resp.content
+            resp.raise_for_status()
+            data = resp.json()
+            stages["body"] = time.perf_counter() - t2
+            return data
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if self.profiler is not None:
+                stages["total"] = time.perf_counter() - t0
+                self.profiler.record(action, params, stages, status=status, error=error)
 
     def holdings(self):
         url = f"{self.conn.BASE_URL}/holdings"
@@ -48,3 +96,45 @@ class IntegrateOrders:
         resp = requests.get(url, headers=self.conn.headers)
         resp.raise_for_status()
         return resp.json()
+
+    def orders(self):
+        url = f"{self.conn.BASE_URL}/orders"
+        resp = requests.get(url, headers=self.conn.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    def tradebook(self):
+        url = f"{self.conn.BASE_URL}/trades"
+        resp = requests.get(url, headers=self.conn.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    def place_order(self, tradingsymbol, exchange, order_type, quantity, product_type, price_type, price="0", **kwargs):
+        params = {
+            "tradingsymbol": tradingsymbol,
+            "exchange": exchange,
+            "order_type": order_type,
+            "quantity": str(quantity),
+            "product_type": product_type,
+            "price_type": price_type,
+            "price": str(price),
+            **kwargs,
+        }
+        return self._order_request("place_order", "POST", "/placeorder", params, payload=params)
+
+    def modify_order(self, order_id, tradingsymbol, exchange, order_type, quantity, product_type, price_type, price, **kwargs):
+        params = {
+            "order_id": order_id,
+            "tradingsymbol": tradingsymbol,
+            "exchange": exchange,
+            "order_type": order_type,
+            "quantity": str(quantity),
+            "product_type": product_type,
+            "price_type": price_type,
+            "price": str(price),
+            **kwargs,
+        }
+        return self._order_request("modify_order", "POST", "/modify", params, payload=params)
+
+    def cancel_order(self, order_id):
+        return self._order_request("cancel_order", "GET", f"/cancel/{order_id}", {"order_id": order_id})
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+from integrate import ConnectToIntegrate, IntegrateOrders
+
+STAGES = ("prepare", "to_headers", "body", "total")
+ORDER_ACTIONS = ("place_order", "modify_order", "cancel_order")
+
+class OrderLatencyProfiler:
+    def __init__(self, maxlen=1000):
+        self.log = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, action, params, stages, status=None, error=None):
+        # status is the HTTP code when a response arrived; error is the exception class on failure
+        entry = {
+            "ts": time.time(),
+            "action": action,
+            "params": dict(params),
+            "status": status,
+            "error": error,
+            **{stage: stages.get(stage) for stage in STAGES},
+        }
+        with self._lock:
+            self.log.append(entry)
+        return entry
+
+    def error_count(self):
+        with self._lock:
+            return sum(1 for row in self.log if row["error"])
+
+    def clear(self):
+        with self._lock:
+            self.log.clear()
+
+    def to_dataframe(self):
+        with self._lock:
+            rows = list(self.log)
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows)
+        for stage in STAGES:
+            # Failed calls leave later stages as None, so coerce to float NaN before scaling
+            df[f"{stage}_ms"] = (pd.to_numeric(df[stage], errors="coerce") * 1000).round(2)
+        df["time"] = pd.to_datetime(df["ts"], unit="s")
+        return df[["time", "action", "status", "error"] + [f"{s}_ms" for s in STAGES]]
+
+    def summary(self):
+        df = self.to_dataframe()
+        if df.empty:
+            return df
+        cols = [f"{s}_ms" for s in STAGES]
+        grouped = df.groupby("action")[cols]
+        out = grouped.quantile([0.5, 0.95, 0.99]).unstack()
+        out.columns = [f"{col} p{int(q * 100)}" for col, q in out.columns]
+        out.insert(0, "count", grouped.size())
+        out.insert(1, "errors", df["error"].notna().groupby(df["action"]).sum())
+        return out.round(2).reset_index()
+
+    def save_session(self, path):
+        with self._lock:
+            rows = list(self.log)
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps({"ts": row["ts"], "action": row["action"], "params": row["params"]}) + "\n")
+
+def load_session(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class _LocalBrokerHandler(BaseHTTPRequestHandler):
+    def _ack(self, payload):
+        broker = self.server.broker
+        # Delay before the status line, so it shows up in the to_headers stage like broker processing time
+        if broker.response_delay:
+            time.sleep(broker.response_delay)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        params = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/placeorder"):
+            order_id = uuid.uuid4().hex[:12]
+            self.server.broker.orders[order_id] = params
+            self._ack({"status": "SUCCESS", "order_id": order_id, "message": "Order placed (local broker)"})
+        elif self.path.endswith("/modify"):
+            self._ack({"status": "SUCCESS", "order_id": params.get("order_id"), "message": "Order modified (local broker)"})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        if "/cancel/" in self.path:
+            order_id = self.path.rsplit("/", 1)[-1]
+            self.server.broker.orders.pop(order_id, None)
+            self._ack({"status": "SUCCESS", "order_id": order_id, "message": "Order cancelled (local broker)"})
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalBroker:
+    # Stand-in for the Integrate order endpoints on localhost; nothing leaves the machine
+    def __init__(self, host="127.0.0.1", port=0, response_delay=0.0):
+        self.response_delay = response_delay
+        self.orders = {}
+        self.server = ThreadingHTTPServer((host, port), _LocalBrokerHandler)
+        self.server.broker = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def replay_session(session, speed=0.0, response_delay=0.0, max_gap=5.0, profiler=None):
+    # Re-issue recorded order actions against a LocalBroker, preserving their spacing scaled by speed
+    # (speed <= 0 fires them back to back). Any single wait is capped at max_gap seconds so idle stretches
+    # in a day-long session don't stall the replay. Failed actions are recorded with their error by
+    # IntegrateOrders. Returns the profiler holding the replay timings.
+    profiler = profiler or OrderLatencyProfiler()
+    with LocalBroker(response_delay=response_delay) as broker:
+        conn = ConnectToIntegrate()
+        conn.BASE_URL = broker.base_url
+        io = IntegrateOrders(conn, profiler=profiler)
+        prev_ts = None
+        for entry in session:
+            if entry.get("action") not in ORDER_ACTIONS:
+                continue
+            if speed > 0 and prev_ts is not None:
+                wait = min((entry["ts"] - prev_ts) / speed, max_gap)
+                if wait > 0:
+                    time.sleep(wait)
+            prev_ts = entry["ts"]
+            try:
+                getattr(io, entry["action"])(**entry["params"])
+            except Exception:
+                # Already in the profiler log with its error; keep replaying the rest of the session
+                continue
+    return profiler